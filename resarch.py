@@ -1,92 +1,491 @@
 import sqlite3
 import os
-from datetime import datetime
 import hashlib
+import functools
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from fpdf import FPDF  # For creating sample PDFs
 
+try:
+    import xxhash  # Duplicate detection doesn't need a cryptographic hash; xxh3 is the fastest
+except ImportError:
+    xxhash = None
+
+try:
+    import blake3  # Much faster than SHA-256 on large PDFs
+except ImportError:
+    blake3 = None
+
+# Read size for hashing; large reads keep the time spent inside the hash (SHA-NI/SIMD) code
+HASH_READ_BUF = 1 << 20
+
+# hashlib.new uses OpenSSL's SHA-256 (SHA-NI accelerated) when CPython is built against it.
+# usedforsecurity=False marks this as non-security use so FIPS-restricted OpenSSL builds
+# still allow it. Pythons before 3.9 reject the keyword, so fall back to hashlib.sha256.
+try:
+    hashlib.new('sha256', usedforsecurity=False)
+except (ValueError, TypeError):
+    _new_sha256 = hashlib.sha256
+else:
+    def _new_sha256():
+        return hashlib.new('sha256', usedforsecurity=False)
+
+# Algorithms file_hash can be computed with
+HASH_ALGORITHMS = ('xxh3_128', 'blake3', 'sha256')
+
+# Hash algorithm for new repositories: the fastest one installed. An existing repository
+# keeps the algorithm recorded in its meta table until migrate_file_hashes() is called.
+if xxhash:
+    DEFAULT_HASH_ALGORITHM = 'xxh3_128'
+elif blake3:
+    DEFAULT_HASH_ALGORITHM = 'blake3'
+else:
+    DEFAULT_HASH_ALGORITHM = 'sha256'
+
+def _new_hasher(algorithm, max_threads=None):
+    """Create a hash object for one of the file_hash algorithms"""
+    if algorithm == 'sha256':
+        return _new_sha256()
+    if algorithm == 'xxh3_128' and xxhash:
+        return xxhash.xxh3_128()
+    if algorithm == 'blake3' and blake3:
+        return blake3.blake3(max_threads=max_threads or blake3.blake3.AUTO)
+    package = 'xxhash' if algorithm == 'xxh3_128' else algorithm
+    raise RuntimeError(f"This repository's file hashes use {algorithm}. Install it with 'pip install {package}' "
+                       "or call migrate_file_hashes() to re-hash with an installed algorithm.")
+
+def _hash_file(file_path, algorithm, buf=None, max_threads=None):
+    """Calculate the hash of a file with the given algorithm"""
+    file_hash = _new_hasher(algorithm, max_threads)
+    if algorithm == 'blake3':
+        # blake3 mmaps the file and hashes it without copying it through Python
+        return file_hash.update_mmap(file_path).hexdigest()
+    view = memoryview(buf if buf is not None else bytearray(HASH_READ_BUF))
+    # Unbuffered, since we read straight into our own buffer
+    with open(file_path, 'rb', buffering=0) as f:
+        while n := f.readinto(view):
+            file_hash.update(view[:n])
+    return file_hash.hexdigest()
+
+def _hash_bytes(data, algorithm):
+    """Hash in-memory data the same way _hash_file hashes a file"""
+    file_hash = _new_hasher(algorithm)
+    file_hash.update(data)
+    return file_hash.hexdigest()
+
+def _hash_file_worker(file_path, algorithm):
+    """Hash one file inside an add_papers_bulk worker process"""
+    # Each worker already has a file of its own, so BLAKE3 only uses a few threads per file
+    return _hash_file(file_path, algorithm, max_threads=4)
+
 #creating class
 class ResearchPaperRepository:
+    _INSERT_PAPER_SQL = '''
+        INSERT INTO papers (
+            title, authors, publication_date, 
+            category, file_path, file_hash, keywords
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    # Trimmed, non-empty names in new.authors, split on commas like _link_authors() does
+    _SPLIT_NEW_AUTHORS_SQL = '''
+        WITH RECURSIVE split(name, rest) AS (
+            SELECT '', new.authors || ','
+            UNION ALL
+            SELECT trim(substr(rest, 1, instr(rest, ',') - 1)), substr(rest, instr(rest, ',') + 1)
+            FROM split WHERE rest <> ''
+        )
+        SELECT name FROM split WHERE name <> ''
+    '''
+
+    # add_papers_bulk only starts worker processes when there is at least this much to hash;
+    # below it, starting them and pickling paths and hashes costs more than it saves
+    _PARALLEL_HASH_MIN_BYTES = 32 << 20
+
+    # Stays under SQLite's bound-parameter limit (999 before SQLite 3.32)
+    _MAX_SQL_PARAMS = 500
+
+    # The sample PDF is rendered once per process (see _render_sample_pdf())
+    _sample_pdf_data = None
+
     def __init__(self, db_name='research_papers.db'):
         self.db_name = db_name
-        self.conn = None
-        self.cursor = None
+        # Each thread gets its own connection, cursor and hash buffer. A thread's connection
+        # is closed by close() in that thread, or when the thread exits.
+        self._local = threading.local()
+        self._closed = False
         self._initialize_database()
+
+    @property
+    def conn(self):
+        """The calling thread's database connection"""
+        return self._get_conn()
+
+    @property
+    def cursor(self):
+        """The calling thread's cursor"""
+        self._get_conn()
+        return self._local.cursor
+
+    def _get_conn(self):
+        """Get the calling thread's connection, opening it on first use"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed repository.")
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        
+        # Page size and auto_vacuum can only be chosen before the first table is created.
+        # Larger pages mean fewer overflow pages for long titles and keyword lists.
+        cursor.execute('SELECT 1 FROM sqlite_master LIMIT 1')
+        if not cursor.fetchone():
+            cursor.execute('PRAGMA page_size=16384')
+            cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        
+        # WAL makes commits cheap and lets readers run alongside a writer
+        self._enable_wal(cursor)
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA cache_size=-64000')  # 64 MB
+        cursor.execute('PRAGMA mmap_size=268435456')  # 256 MB
+        
+        self._local.conn = conn
+        self._local.cursor = cursor
+        self._local.hash_buf = bytearray(HASH_READ_BUF)  # Reused by every _calculate_file_hash call
+        return conn
+
+    @staticmethod
+    def _enable_wal(cursor, timeout=5.0):
+        """
+        Switch the database to WAL mode
+        
+        Switching an older rollback-journal database needs an exclusive lock, and SQLite
+        fails at once instead of waiting for it while other processes have the file open,
+        so retry for up to the connection's default busy timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                cursor.execute('PRAGMA journal_mode=WAL')
+                return
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) or time.monotonic() > deadline:
+                    raise
+                time.sleep(0.01)
 #This func is to initialize database
     def _initialize_database(self):
         """Initialize the database with required tables"""
-        self.conn = sqlite3.connect(self.db_name)
-        self.cursor = self.conn.cursor()
-        
         # Create papers table
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS papers (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 title TEXT NOT NULL,
                 authors TEXT NOT NULL,
-                abstract TEXT,
                 publication_date TEXT,
                 category TEXT,
                 file_path TEXT UNIQUE,
                 file_hash TEXT UNIQUE,
-                upload_date TEXT NOT NULL,
+                upload_date INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
                 keywords TEXT
             )
         ''')
         
-        # Create full-text search virtual table if FTS5 is available
+        # Abstracts live in their own table so papers rows stay small for searches
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS paper_abstract (
+                paper_id INTEGER PRIMARY KEY,
+                abstract TEXT
+            )
+        ''')
+        rebuild_fts = self._migrate_papers_table()
+        
+        # Content of papers_fts, with each paper's abstract joined back in
+        self.cursor.execute('''
+            CREATE VIEW IF NOT EXISTS papers_content AS
+            SELECT p.id, p.title, p.authors, ab.abstract, p.keywords
+            FROM papers p
+            LEFT JOIN paper_abstract ab ON ab.paper_id = p.id
+        ''')
+        
+        # Indexes for the search_papers filters; the year index matches the substr() in the query
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_papers_category ON papers(category)')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_papers_year ON papers(substr(publication_date, 1, 4))')
+        
+        # Authors of each paper, split out of papers.authors so the author filter can use an index
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS authors (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE COLLATE NOCASE
+            )
+        ''')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS paper_authors (
+                paper_id INTEGER NOT NULL,
+                author_id INTEGER NOT NULL,
+                PRIMARY KEY (paper_id, author_id)
+            )
+        ''')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_paper_authors_author ON paper_authors(author_id)')
+        self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS paper_authors_ad AFTER DELETE ON papers
+            BEGIN
+                DELETE FROM paper_authors WHERE paper_id = old.id;
+            END
+        ''')
+        self.cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS papers_authors_au AFTER UPDATE OF authors ON papers
+            BEGIN
+                DELETE FROM paper_authors WHERE paper_id = old.id;
+                INSERT OR IGNORE INTO authors (name) SELECT name FROM ({self._SPLIT_NEW_AUTHORS_SQL});
+                INSERT OR IGNORE INTO paper_authors (paper_id, author_id)
+                SELECT new.id, id FROM authors WHERE name IN ({self._SPLIT_NEW_AUTHORS_SQL});
+            END
+        ''')
+        
+        # Create full-text search virtual table (search_papers relies on FTS5)
         try:
             self.cursor.execute('''
                 CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
                     title, authors, abstract, keywords, 
-                    content='papers', 
+                    content='papers_content', 
                     content_rowid='id'
                 )
             ''')
             
-            # Create triggers to keep FTS table in sync
+            # Create triggers to keep FTS table in sync. A paper is indexed once its
+            # paper_abstract row is inserted, which _insert_paper always does.
             self.cursor.execute('''
-                CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers
+                CREATE TRIGGER IF NOT EXISTS paper_abstract_ai AFTER INSERT ON paper_abstract
                 BEGIN
                     INSERT INTO papers_fts(rowid, title, authors, abstract, keywords)
-                    VALUES (new.id, new.title, new.authors, new.abstract, new.keywords);
+                    SELECT id, title, authors, new.abstract, keywords FROM papers WHERE id = new.paper_id;
                 END
             ''')
             
             self.cursor.execute('''
                 CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers
                 BEGIN
-                    DELETE FROM papers_fts WHERE rowid = old.id;
+                    INSERT INTO papers_fts(papers_fts, rowid, title, authors, abstract, keywords)
+                    VALUES ('delete', old.id, old.title, old.authors,
+                            (SELECT abstract FROM paper_abstract WHERE paper_id = old.id), old.keywords);
+                    DELETE FROM paper_abstract WHERE paper_id = old.id;
+                END
+            ''')
+            
+            self.cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE OF title, authors, keywords ON papers
+                BEGIN
+                    INSERT INTO papers_fts(papers_fts, rowid, title, authors, abstract, keywords)
+                    SELECT 'delete', old.id, old.title, old.authors, abstract, old.keywords
+                    FROM paper_abstract WHERE paper_id = old.id;
+                    INSERT INTO papers_fts(rowid, title, authors, abstract, keywords)
+                    SELECT new.id, new.title, new.authors, abstract, new.keywords
+                    FROM paper_abstract WHERE paper_id = new.id;
                 END
             ''')
             
             self.cursor.execute('''
-                CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers
+                CREATE TRIGGER IF NOT EXISTS paper_abstract_au AFTER UPDATE ON paper_abstract
                 BEGIN
-                    DELETE FROM papers_fts WHERE rowid = old.id;
+                    INSERT INTO papers_fts(papers_fts, rowid, title, authors, abstract, keywords)
+                    SELECT 'delete', id, title, authors, old.abstract, keywords FROM papers WHERE id = old.paper_id;
                     INSERT INTO papers_fts(rowid, title, authors, abstract, keywords)
-                    VALUES (new.id, new.title, new.authors, new.abstract, new.keywords);
+                    SELECT id, title, authors, new.abstract, keywords FROM papers WHERE id = new.paper_id;
                 END
             ''')
+            
+            if rebuild_fts:
+                self.cursor.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
         except sqlite3.OperationalError as e:
-            print(f"Note: FTS5 might not be available. Some search features may be limited. Error: {e}")
+            self.close()
+            raise RuntimeError(f"SQLite FTS5 is required but not available (SQLite {sqlite3.sqlite_version}). "
+                               "Use a Python built against an SQLite with FTS5 enabled.") from e
+        
+        # Key/value table for repository settings such as the hash algorithm
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+        
+        # Remember file hashes by (path, mtime, size) so unchanged files aren't re-hashed
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS file_hash_cache (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER,
+                size INTEGER,
+                file_hash TEXT
+            )
+        ''')
+        self._load_hash_algorithm()
+        # Papers added before the authors tables existed
+        self._link_new_paper_authors()
         
         self.conn.commit()
+
+    def _migrate_papers_table(self):
+        """
+        Rebuild the papers table of older databases into the current schema
+        
+        Older databases store upload_date as local-time TEXT and keep the abstract in papers.
+        SQLite can't change a column type in place (or drop a column before 3.35), so the
+        rows are copied into a new table. Dropping the old table drops its indexes and
+        triggers, which _initialize_database re-creates.
+        
+        Returns:
+            bool: True if papers_fts was dropped and needs rebuilding
+        """
+        if not self._legacy_papers_columns():
+            return False
+        
+        # Take the write lock before looking again: another process opening the same
+        # database may have migrated it while this one waited
+        self.cursor.execute('BEGIN IMMEDIATE')
+        with self.conn:
+            column_types = self._legacy_papers_columns()
+            if not column_types:
+                return False
+            text_upload_date = column_types['upload_date'] == 'TEXT'
+            
+            # The old FTS table, its triggers and the content view read papers; they are re-created afterwards
+            for trigger in ('papers_ai', 'papers_ad', 'papers_au'):
+                self.cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            self.cursor.execute('DROP TABLE IF EXISTS papers_fts')
+            self.cursor.execute('DROP VIEW IF EXISTS papers_content')
+            
+            if 'abstract' in column_types:
+                self.cursor.execute('INSERT INTO paper_abstract (paper_id, abstract) SELECT id, abstract FROM papers')
+            self.cursor.execute('''
+                CREATE TABLE papers_new (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    authors TEXT NOT NULL,
+                    publication_date TEXT,
+                    category TEXT,
+                    file_path TEXT UNIQUE,
+                    file_hash TEXT UNIQUE,
+                    upload_date INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                    keywords TEXT
+                )
+            ''')
+            # Old upload dates were stored in local time
+            upload_date = "CAST(strftime('%s', upload_date, 'utc') AS INTEGER)" if text_upload_date else 'upload_date'
+            self.cursor.execute(f'''
+                INSERT INTO papers_new
+                SELECT id, title, authors, publication_date, category, file_path, file_hash,
+                       {upload_date}, keywords
+                FROM papers
+            ''')
+            self.cursor.execute('DROP TABLE papers')
+            self.cursor.execute('ALTER TABLE papers_new RENAME TO papers')
+        return True
+
+    def _legacy_papers_columns(self):
+        """Column types of the papers table if it still has the old schema, otherwise None"""
+        self.cursor.execute('PRAGMA table_info(papers)')
+        column_types = {row[1]: row[2] for row in self.cursor.fetchall()}
+        if column_types['upload_date'] == 'TEXT' or 'abstract' in column_types:
+            return column_types
+        return None
+
+    def _load_hash_algorithm(self):
+        """Read the file_hash algorithm of this database from meta, recording it for new databases"""
+        self.cursor.execute("SELECT value FROM meta WHERE key = 'hash_algorithm'")
+        row = self.cursor.fetchone()
+        if row:
+            self._hash_algorithm = row[0]
+            return
+        
+        # Databases created before the meta table always used SHA-256
+        self.cursor.execute('SELECT 1 FROM papers WHERE file_hash IS NOT NULL LIMIT 1')
+        algorithm = 'sha256' if self.cursor.fetchone() else DEFAULT_HASH_ALGORITHM
+        # Another process opening the database at the same time may record it first
+        self.cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('hash_algorithm', ?)",
+                            (algorithm,))
+        self.cursor.execute("SELECT value FROM meta WHERE key = 'hash_algorithm'")
+        self._hash_algorithm = self.cursor.fetchone()[0]
+
+    def migrate_file_hashes(self, algorithm=None):
+        """
+        Re-hash the stored papers' files with another algorithm
+        
+        Papers whose files no longer exist keep their old hash.
+        
+        Args:
+            algorithm (str, optional): 'xxh3_128', 'blake3' or 'sha256'
+                (defaults to the fastest one installed)
+            
+        Returns:
+            int: Number of papers re-hashed
+        """
+        algorithm = algorithm or DEFAULT_HASH_ALGORITHM
+        if algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"Unknown hash algorithm {algorithm!r}; expected one of {', '.join(HASH_ALGORITHMS)}")
+        if algorithm == self._hash_algorithm:
+            return 0
+        _new_hasher(algorithm)  # Fail before touching anything if it isn't installed
+        
+        previous_algorithm = self._hash_algorithm
+        self._hash_algorithm = algorithm
+        rehashed = 0
+        try:
+            with self.conn:
+                self.cursor.execute('DELETE FROM file_hash_cache')
+                self.cursor.execute('SELECT id, file_path FROM papers WHERE file_path IS NOT NULL')
+                for paper_id, file_path in self.cursor.fetchall():
+                    if os.path.exists(file_path):
+                        self.cursor.execute('UPDATE papers SET file_hash = ? WHERE id = ?',
+                                            (self._get_file_hash(file_path), paper_id))
+                        rehashed += 1
+                self.cursor.execute("UPDATE meta SET value = ? WHERE key = 'hash_algorithm'", (algorithm,))
+        except Exception:
+            self._hash_algorithm = previous_algorithm
+            raise
+        return rehashed
 #This is to create sample pdf
     def create_sample_pdf(self, filename="sample_paper.pdf"):
         """Create a sample PDF file for testing"""
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", size=12)
-        pdf.cell(200, 10, txt="Quantam Mechanishm", ln=1, align='C')
-        pdf.cell(200, 10, txt="By: John Wings", ln=2, align='C')
-        pdf.multi_cell(0, 10, txt="This is a sample research paper about Quantam Mechanish. It demonstrates how to store research papers in a repository system.")
-        pdf.output(filename)
+        data = self._render_sample_pdf()
+        sample_hash = _hash_bytes(data, self._hash_algorithm)
+        # Nothing to write if the file already holds the sample
+        if os.path.exists(filename) and self._get_file_hash(filename) == sample_hash:
+            return filename
+        # The bytes are already in memory, so write them with one unbuffered write
+        with open(filename, 'wb', buffering=0) as f:
+            f.write(data)
+        # We already know the hash, so add_paper doesn't have to read the file back
+        with self.conn:
+            self._cache_file_hash(filename, os.stat(filename), sample_hash)
         return filename
 
+    @classmethod
+    def _render_sample_pdf(cls):
+        """Render the sample PDF in memory, only the first time it is needed"""
+        if cls._sample_pdf_data is None:
+            pdf = FPDF()
+            pdf.add_page()
+            pdf.set_font("Arial", size=12)
+            pdf.cell(200, 10, txt="Quantam Mechanishm", ln=1, align='C')
+            pdf.cell(200, 10, txt="By: John Wings", ln=2, align='C')
+            pdf.multi_cell(0, 10, txt="This is a sample research paper about Quantam Mechanish. It demonstrates how to store research papers in a repository system.")
+            data = pdf.output(dest='S')
+            # PyFPDF returns a latin-1 str, fpdf2 returns a bytearray
+            cls._sample_pdf_data = data.encode('latin-1') if isinstance(data, str) else bytes(data)
+        return cls._sample_pdf_data
+
     def clear_test_data(self):
         """Clear all test data from the database"""
         self.cursor.execute("DELETE FROM papers WHERE title LIKE 'Deep Learning for%'")
         self.conn.commit()
+        # Give the freed pages back to the file system. Only databases created with
+        # auto_vacuum=INCREMENTAL (see _get_conn()) shrink; for others this does nothing.
+        # execute() would only step it once, freeing a single page; executescript() runs it to the end.
+        self.conn.executescript('PRAGMA incremental_vacuum')
         if os.path.exists("sample_paper.pdf"):
             os.remove("sample_paper.pdf")
         print("Cleared all test data")
@@ -109,48 +508,189 @@ class ResearchPaperRepository:
         Returns:
             int: ID of the inserted paper
         """
-        if file_path:
-            if not os.path.exists(file_path):
-                if create_sample_if_missing:
-                    file_path = self.create_sample_pdf(file_path)
-                    print(f"Created sample PDF at: {file_path}")
-                else:
-                    raise FileNotFoundError(f"File not found: {file_path}. Set create_sample_if_missing=True to auto-create a sample.")
-            
-            # Calculate file hash to detect duplicates
-            file_hash = self._calculate_file_hash(file_path)
-            
-            # Check if paper with same hash already exists
-            self.cursor.execute('SELECT id FROM papers WHERE file_hash = ?', (file_hash,))
-            if self.cursor.fetchone():
-                print("Note: This paper already exists in the repository (same file content)")
-                return None
-        else:
-            file_path = None
-            file_hash = None
+        # One transaction per call: committed on return, rolled back if anything fails
+        with self.conn:
+            if file_path:
+                if not os.path.exists(file_path):
+                    if create_sample_if_missing:
+                        file_path = self.create_sample_pdf(file_path)
+                        print(f"Created sample PDF at: {file_path}")
+                    else:
+                        raise FileNotFoundError(f"File not found: {file_path}. Set create_sample_if_missing=True to auto-create a sample.")
+                
+                # Calculate file hash to detect duplicates
+                file_hash = self._get_file_hash(file_path)
+                
+                # Check if paper with same hash already exists
+                self.cursor.execute('SELECT id FROM papers WHERE file_hash = ?', (file_hash,))
+                if self.cursor.fetchone():
+                    print("Note: This paper already exists in the repository (same file content)")
+                    return None
+            else:
+                file_path = None
+                file_hash = None
+                
+            paper_id = self._insert_paper(title, authors, abstract, publication_date, category,
+                                          file_path, file_hash, keywords)
+        return paper_id
+
+    def add_papers_bulk(self, records):
+        """
+        Add many research papers at once, hashing large batches of files in parallel
+        
+        Args:
+            records (list): Dicts with the same keys as the add_paper arguments
+                (title, authors, file_path, abstract, publication_date, category, keywords)
             
-        # Get current date for upload_date
-        upload_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        Returns:
+            int: Number of papers inserted (papers whose file content or file path
+                is already stored are skipped)
+        """
+        records = list(records)
+        paths = []
+        for record in records:
+            file_path = record.get('file_path')
+            if file_path:
+                if not os.path.exists(file_path):
+                    raise FileNotFoundError(f"File not found: {file_path}")
+                paths.append(file_path)
         
-        self.cursor.execute('''
-            INSERT INTO papers (
-                title, authors, abstract, publication_date, 
-                category, file_path, file_hash, upload_date, keywords
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (title, authors, abstract, publication_date, category, 
-              file_path, file_hash, upload_date, keywords))
+        # Take hashes from the cache where possible and hash the rest, in one worker process
+        # per core if there is enough to hash
+        hashes = {}
+        stale = {}
+        for path in paths:
+            file_hash, stat = self._get_cached_file_hash(path)
+            if file_hash:
+                hashes[path] = file_hash
+            else:
+                stale[path] = stat
+        workers = min(len(stale), os.cpu_count() or 1)
+        if workers > 1 and sum(stat.st_size for stat in stale.values()) > self._PARALLEL_HASH_MIN_BYTES:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                hashes.update(zip(stale, pool.map(_hash_file_worker, stale, [self._hash_algorithm] * len(stale))))
+        else:
+            hashes.update((path, self._calculate_file_hash(path)) for path in stale)
         
+        # The whole batch is one transaction: either every row is inserted or none is
+        with self.conn:
+            for path, stat in stale.items():
+                self._cache_file_hash(path, stat, hashes[path])
+            
+            seen_hashes = self._find_stored_values('file_hash', hashes.values())
+            stored_paths = self._find_stored_values('file_path', paths)
+            rows = []
+            for record in records:
+                file_path = record.get('file_path') or None
+                file_hash = hashes.get(file_path)
+                if file_hash:
+                    # Skip files already in the repository or repeated within this batch
+                    if file_path in stored_paths or file_hash in seen_hashes:
+                        continue
+                    seen_hashes.add(file_hash)
+                rows.append((record['title'], record['authors'], record.get('abstract'),
+                             record.get('publication_date'), record.get('category'),
+                             file_path, file_hash, record.get('keywords')))
+            
+            for row in rows:
+                self._insert_paper(*row)
+        return len(rows)
+
+    def _find_stored_values(self, column, values):
+        """Return which of the values are already stored in a papers column, with one IN (...) query per chunk"""
+        values = list(set(values))
+        stored = set()
+        for i in range(0, len(values), self._MAX_SQL_PARAMS):
+            chunk = values[i:i + self._MAX_SQL_PARAMS]
+            self.cursor.execute(f"SELECT {column} FROM papers WHERE {column} IN ({','.join('?' * len(chunk))})",
+                                chunk)
+            stored.update(row[0] for row in self.cursor)
+        return stored
+
+    def _insert_paper(self, title, authors, abstract, publication_date, category,
+                      file_path, file_hash, keywords):
+        """Insert a paper with its abstract and authors, without committing; returns its ID"""
+        # upload_date is filled in by the column default
+        self.cursor.execute(self._INSERT_PAPER_SQL, (title, authors, publication_date, category,
+                                                     file_path, file_hash, keywords))
         paper_id = self.cursor.lastrowid
-        self.conn.commit()
+        # Every paper gets an abstract row, even an empty one; that is what adds it to papers_fts
+        self.cursor.execute('INSERT INTO paper_abstract (paper_id, abstract) VALUES (?, ?)', (paper_id, abstract))
+        self._link_authors(paper_id, authors)
         return paper_id
 
+    def _link_authors(self, paper_id, authors):
+        """Add the comma-separated authors of a paper to the authors and paper_authors tables"""
+        names = [(name.strip(),) for name in authors.split(',') if name.strip()]
+        self.cursor.executemany('INSERT OR IGNORE INTO authors (name) VALUES (?)', names)
+        self.cursor.executemany('''
+            INSERT OR IGNORE INTO paper_authors (paper_id, author_id)
+            SELECT ?, id FROM authors WHERE name = ?
+        ''', [(paper_id, name) for (name,) in names])
+
+    def _link_new_paper_authors(self):
+        """Link authors for every paper that has no paper_authors rows yet"""
+        self.cursor.execute('SELECT id, authors FROM papers WHERE id NOT IN (SELECT paper_id FROM paper_authors)')
+        for paper_id, authors in self.cursor.fetchall():
+            self._link_authors(paper_id, authors)
+
+    def _get_file_hash(self, file_path):
+        """Get the hash of a file, only re-hashing it if it changed since it was last seen"""
+        file_hash, stat = self._get_cached_file_hash(file_path)
+        if not file_hash:
+            file_hash = self._calculate_file_hash(file_path)
+            self._cache_file_hash(file_path, stat, file_hash)
+        return file_hash
+
+    def _get_cached_file_hash(self, file_path):
+        """Look up a file in the hash cache; returns (hash or None, os.stat result)"""
+        stat = os.stat(file_path)
+        self.cursor.execute('SELECT mtime_ns, size, file_hash FROM file_hash_cache WHERE path = ?',
+                            (os.path.abspath(file_path),))
+        row = self.cursor.fetchone()
+        if row and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            return row[2], stat
+        return None, stat
+
+    def _cache_file_hash(self, file_path, stat, file_hash):
+        """Store a file hash along with the mtime and size it was computed for"""
+        self.cursor.execute('INSERT OR REPLACE INTO file_hash_cache (path, mtime_ns, size, file_hash) VALUES (?, ?, ?, ?)',
+                            (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, file_hash))
+
     def _calculate_file_hash(self, file_path):
-        """Calculate SHA-256 hash of a file"""
-        sha256_hash = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        """Calculate the hash of a file with this repository's algorithm (xxh3_128, BLAKE3 or SHA-256)"""
+        self._get_conn()
+        return _hash_file(file_path, self._hash_algorithm, self._local.hash_buf)
+
+    # Keys of the dicts returned by search_papers, in the order of the SELECT list below
+    _SEARCH_COLUMNS = ('id', 'title', 'authors', 'abstract', 'publication_date',
+                       'category', 'file_path', 'upload_date', 'keywords')
+
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _build_search_sql(has_query, has_category, has_author, has_year):
+        """Build the search_papers SQL for one combination of filters (cached, 16 combinations)"""
+        sql = '''
+            SELECT p.id, p.title, p.authors, ab.abstract, p.publication_date, 
+                   p.category, p.file_path, datetime(p.upload_date, 'unixepoch', 'localtime') AS upload_date, p.keywords
+            FROM papers p
+        '''
+        if has_query:
+            sql += ' JOIN papers_fts f ON p.id = f.rowid'
+        if has_author:
+            sql += ' JOIN paper_authors pa ON pa.paper_id = p.id JOIN authors a ON a.id = pa.author_id'
+        sql += ' LEFT JOIN paper_abstract ab ON ab.paper_id = p.id WHERE 1=1'
+        
+        # Add filters
+        if has_query:
+            sql += ' AND papers_fts MATCH ?'
+        if has_category:
+            sql += ' AND p.category = ?'
+        if has_author:
+            sql += ' AND a.name = ?'
+        if has_year:
+            sql += ' AND substr(p.publication_date, 1, 4) = ?'
+        return sql
 # This func defines searching for research paper
     def search_papers(self, query=None, category=None, author=None, year=None):
         """
@@ -159,56 +699,17 @@ class ResearchPaperRepository:
         Args:
             query (str, optional): Search query
             category (str, optional): Filter by category
-            author (str, optional): Filter by author
+            author (str, optional): Filter by author name (exact, case-insensitive)
             year (str, optional): Filter by publication year
             
         Returns:
             list: List of matching papers (as dictionaries)
         """
-        # Base query
-        if query:
-            try:
-                sql = '''
-                    SELECT p.id, p.title, p.authors, p.abstract, p.publication_date, 
-                           p.category, p.file_path, p.upload_date, p.keywords
-                    FROM papers p
-                    JOIN papers_fts f ON p.id = f.rowid
-                    WHERE papers_fts MATCH ?
-                '''
-                params = [query]
-            except sqlite3.OperationalError:
-                # Fallback to simple search if FTS5 not available
-                sql = '''
-                    SELECT p.id, p.title, p.authors, p.abstract, p.publication_date, 
-                           p.category, p.file_path, p.upload_date, p.keywords
-                    FROM papers p
-                    WHERE (title LIKE ? OR abstract LIKE ? OR authors LIKE ? OR keywords LIKE ?)
-                '''
-                params = [f'%{query}%', f'%{query}%', f'%{query}%', f'%{query}%']
-        else:
-            sql = '''
-                SELECT p.id, p.title, p.authors, p.abstract, p.publication_date, 
-                       p.category, p.file_path, p.upload_date, p.keywords
-                FROM papers p
-                WHERE 1=1
-            '''
-            params = []
+        sql = self._build_search_sql(bool(query), bool(category), bool(author), bool(year))
+        params = [value for value in (query, category, author, year) if value]
         
-        # Add filters
-        if category:
-            sql += ' AND p.category = ?'
-            params.append(category)
-        if author:
-            sql += ' AND p.authors LIKE ?'
-            params.append(f'%{author}%')
-        if year:
-            sql += ' AND strftime("%Y", p.publication_date) = ?'
-            params.append(year)
-            
-        self.cursor.execute(sql, params)
-        columns = [col[0] for col in self.cursor.description]
-        results = [dict(zip(columns, row)) for row in self.cursor.fetchall()]
-        return results
+        columns = self._SEARCH_COLUMNS
+        return [dict(zip(columns, row)) for row in self.cursor.execute(sql, params)]
 # this function is used to categrories research_paper
     def get_all_categories(self):
         """Get all distinct categories in the repository"""
@@ -216,9 +717,18 @@ class ResearchPaperRepository:
         return [row[0] for row in self.cursor.fetchall()]
 
     def close(self):
-        """Close the database connection"""
-        if self.conn:
-            self.conn.close()
+        """
+        Close the calling thread's database connection
+        
+        The repository can't be used afterwards, from any thread. Other threads' connections
+        are left open until those threads call close() or exit. Every public method commits
+        before returning, so nothing is lost.
+        """
+        self._closed = True
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            del self._local.conn, self._local.cursor, self._local.hash_buf
 
 def main():
     # Example usage
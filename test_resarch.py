@@ -0,0 +1,78 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+from resarch import ResearchPaperRepository
+
+LEGACY_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'research_papers.db')
+
+
+def _open_repository(db_name, barrier, opens):
+    """Open and close a repository several times after all workers are ready; returns errors"""
+    errors = []
+    barrier.wait()
+    for _ in range(opens):
+        try:
+            ResearchPaperRepository(db_name).close()
+        except Exception as e:
+            errors.append(repr(e))
+    return errors
+
+
+class LegacyDatabaseTest(unittest.TestCase):
+    """Opening the committed research_papers.db migrates it without losing data"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_name = os.path.join(self.tmp_dir, 'research_papers.db')
+        shutil.copy(LEGACY_DB, self.db_name)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def assert_migrated(self):
+        repo = ResearchPaperRepository(self.db_name)
+        try:
+            papers = repo.search_papers('explores', author='Jane Doe', year='2023')
+            self.assertEqual([paper['id'] for paper in papers], [4])
+            self.assertEqual(papers[0]['abstract'], 'This paper explores deep learning techniques for NLP tasks...')
+            self.assertEqual(papers[0]['upload_date'][:4], '2025')
+            self.assertEqual(repo.cursor.execute('PRAGMA integrity_check').fetchall(), [('ok',)])
+            repo.cursor.execute("INSERT INTO papers_fts(papers_fts) VALUES ('integrity-check')")
+        finally:
+            repo.close()
+
+    def test_repeated_opens(self):
+        for _ in range(3):
+            self.assert_migrated()
+
+    def test_author_update_relinks(self):
+        repo = ResearchPaperRepository(self.db_name)
+        try:
+            with repo.conn:
+                repo.cursor.execute("UPDATE papers SET authors = ' Ada Lovelace , Alan Turing' WHERE id = 4")
+            self.assertEqual(repo.search_papers(author='Jane Doe'), [])
+            self.assertEqual([paper['id'] for paper in repo.search_papers(author='ada lovelace')], [4])
+            self.assertEqual([paper['id'] for paper in repo.search_papers(author='Alan Turing')], [4])
+        finally:
+            repo.close()
+
+    def test_concurrent_opens(self):
+        # Several worker processes open the same legacy file at once; only one may migrate it
+        workers = 3
+        with multiprocessing.Manager() as manager, multiprocessing.Pool(workers) as pool:
+            for _ in range(5):
+                shutil.copy(LEGACY_DB, self.db_name)
+                for suffix in ('-wal', '-shm'):
+                    if os.path.exists(self.db_name + suffix):
+                        os.remove(self.db_name + suffix)
+                barrier = manager.Barrier(workers)
+                results = pool.starmap(_open_repository, [(self.db_name, barrier, 3)] * workers)
+                self.assertEqual([error for errors in results for error in errors], [])
+                self.assert_migrated()
+
+
+if __name__ == '__main__':
+    unittest.main()